@@ -0,0 +1,87 @@
+# Aho-Corasick automaton over a list of patterns, for the reference
+# solutions of the problems about strings that must avoid (or contain)
+# given substrings. The states are the prefixes of the patterns, and the
+# transition from each state with each letter leads to the state of the
+# longest pattern prefix that is a suffix of the text read so far. A
+# state is dead if some pattern ends at it, directly or through its
+# chain of failure links.
+
+from collections import deque
+
+# Build the complete transition table over the given letters, as a list
+# with a row for each state, and the list of dead states. State 0 is the
+# initial state of the empty prefix. A pattern that uses some letter
+# not among the given letters can never occur in the text, so it gets no
+# states, which the search over the letters could never reach anyway.
+
+def build_automaton(patterns, letters):
+    goto, dead, alphabet = [dict()], [False], set(letters)
+    for pattern in patterns:
+        if not alphabet.issuperset(pattern):
+            continue
+        s = 0
+        for c in pattern:
+            if c not in goto[s]:
+                goto[s][c] = len(goto)
+                goto.append(dict())
+                dead.append(False)
+            s = goto[s][c]
+        dead[s] = True
+    # States in breadth first order, so that the failure link of each
+    # state, being a shorter prefix, has its row of the table filled in
+    # before the row of that state itself.
+    table, fail = [None] * len(goto), [0] * len(goto)
+    queue = deque([0])
+    while queue:
+        s = queue.popleft()
+        back = table[fail[s]] if s > 0 else None
+        table[s] = [goto[s].get(c, back[i] if back else 0) for (i, c) in enumerate(letters)]
+        for (i, c) in enumerate(letters):
+            t = goto[s].get(c)
+            if t is not None:
+                fail[t] = back[i] if back else 0
+                dead[t] = dead[t] or dead[fail[t]]
+                queue.append(t)
+    return table, dead
+
+# For each r up to n, the list of flags telling whether some string of r
+# letters can be read from each state without ever entering a dead one.
+# The search for valid strings never enters a state that cannot be
+# completed, so every branch it explores produces at least one string.
+
+def viable_states(table, dead, n):
+    viable = [[not d for d in dead]]
+    for r in range(n):
+        prev = viable[-1]
+        viable.append([not d and any(prev[t] for t in row) for (row, d) in zip(table, dead)])
+    return viable
+
+# Generate all strings of n letters that contain none of the patterns,
+# in the order of the given letters, with a depth first search over the
+# states of the automaton.
+
+def strings_avoiding(letters, n, patterns):
+    table, dead = build_automaton(patterns, letters)
+    viable = viable_states(table, dead, n)
+    if not viable[n][0]:
+        return
+    stack = [(0, '', n)]
+    while stack:
+        (s, prefix, r) = stack.pop()
+        if r == 0:
+            yield prefix
+            continue
+        ok = viable[r - 1]
+        for (c, t) in reversed(list(zip(letters, table[s]))):
+            if ok[t]:
+                stack.append((t, prefix + c, r - 1))
+
+# Count the strings of n letters that contain none of the patterns,
+# without generating them.
+
+def count_avoiding(letters, n, patterns):
+    table, dead = build_automaton(patterns, letters)
+    counts = [0 if d else 1 for d in dead]
+    for _ in range(n):
+        counts = [0 if d else sum(counts[t] for t in row) for (row, d) in zip(table, dead)]
+    return counts[0]
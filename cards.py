@@ -0,0 +1,122 @@
+# Compact representation of playing cards for the card problems, and a
+# batched evaluator for bridge hands. Each card is a small integer
+# 13 * suit + (rank - 2), with the suits in the same order as in the
+# deck of the tester, and a hand is a 52-bit integer whose bit for each
+# card in the hand is on. The thirteen bits of each suit then form a
+# rank mask, and every property of a suit that the problems ask about
+# is looked up from tables precomputed for all 8192 rank masks.
+
+suits = ['clubs', 'diamonds', 'hearts', 'spades']
+
+rank_names = ['two', 'three', 'four', 'five', 'six', 'seven', 'eight',
+              'nine', 'ten', 'jack', 'queen', 'king', 'ace']
+
+# The suits in the order that bridge lists them.
+bridge_order = [3, 2, 1, 0]
+
+# The card tuple of each card index, the rank and suit of each card
+# index, and the card index of each card tuple. The name 'trey' used in
+# the problem specifications is accepted as well as 'three'.
+
+card_tuples = [(rank, suit) for suit in suits for rank in rank_names]
+card_rank = [2 + i % 13 for i in range(52)]
+card_suit = [i // 13 for i in range(52)]
+card_index = {card: i for (i, card) in enumerate(card_tuples)}
+card_index.update({('trey', suit): 13 * s + 1 for (s, suit) in enumerate(suits)})
+suit_index = {suit: s for (s, suit) in enumerate(suits)}
+
+def encode_card(card):
+    return card_index[card]
+
+def decode_card(c):
+    return card_tuples[c]
+
+def encode_hand(hand):
+    mask = 0
+    for card in hand:
+        mask |= 1 << card_index[card]
+    return mask
+
+def decode_hand(mask):
+    return [card_tuples[c] for c in range(52) if mask >> c & 1]
+
+def encode_hands(hands):
+    return [encode_hand(hand) for hand in hands]
+
+# The rank mask of the given suit in the hand.
+
+def suit_mask(mask, s):
+    return mask >> (13 * s) & 0x1FFF
+
+# Properties of every possible rank mask of a single suit: the number of
+# cards, the high card points, the shorthand string with spot cards as
+# 'x', and the number of losers as counted in the losing trick count.
+
+__lengths, __points, __shorthands, __losers = [], [], [], []
+for r in range(8192):
+    held = [rank for rank in range(14, 1, -1) if r >> (rank - 2) & 1]
+    __lengths.append(len(held))
+    __points.append(sum(max(0, rank - 10) for rank in held))
+    __shorthands.append(''.join('AKQJ'[14 - rank] if rank > 10 else 'x' for rank in held) or '-')
+    top = min(len(held), 3)
+    __losers.append(top - sum(1 for (i, rank) in enumerate([14, 13, 12]) if rank in held[:top] and i < len(held)))
+
+# The batched evaluator. Each function takes a list of hands as 52-bit
+# masks, and returns the list of the corresponding results in the same
+# format as the problem specifications.
+
+def hand_shapes(masks):
+    lengths = __lengths
+    return [[lengths[m >> 39], lengths[m >> 26 & 0x1FFF], lengths[m >> 13 & 0x1FFF], lengths[m & 0x1FFF]]
+            for m in masks]
+
+def shorthands(masks):
+    sh = __shorthands
+    return [f"{sh[m >> 39]} {sh[m >> 26 & 0x1FFF]} {sh[m >> 13 & 0x1FFF]} {sh[m & 0x1FFF]}"
+            for m in masks]
+
+def losing_trick_counts(masks):
+    losers = __losers
+    return [losers[m >> 39] + losers[m >> 26 & 0x1FFF] + losers[m >> 13 & 0x1FFF] + losers[m & 0x1FFF]
+            for m in masks]
+
+def point_counts(masks, trumps):
+    lengths, points = __lengths, __points
+    result = []
+    for (m, trump) in zip(masks, trumps):
+        total, shape = 0, []
+        for s in range(4):
+            r = m >> (13 * s) & 0x1FFF
+            n = lengths[r]
+            total += points[r] + (min(n, 7) - 4 if n > 4 else 0)
+            if trump != 'notrump' and suits[s] != trump:
+                total += 5 if n == 0 else (3 if n == 1 else 0)
+            shape.append(n)
+        if sorted(shape) == [3, 3, 3, 4]:
+            total -= 1
+        result.append(total)
+    return result
+
+# A badugi has four cards of different suits and different ranks, so
+# that each suit has exactly one card and their rank masks are disjoint.
+
+def badugi_flags(masks):
+    lengths = __lengths
+    result = []
+    for m in masks:
+        r = [m >> (13 * s) & 0x1FFF for s in range(4)]
+        result.append(all(lengths[x] == 1 for x in r) and lengths[r[0] | r[1] | r[2] | r[3]] == 4)
+    return result
+
+# The index of the card that wins the trick of the given card indices.
+
+def trick_winner(played, trump = None):
+    t = suit_index[trump] if trump else -1
+    best = played[0]
+    for c in played[1:]:
+        if card_suit[c] == card_suit[best]:
+            if card_rank[c] > card_rank[best]:
+                best = c
+        elif card_suit[c] == t:
+            best = c
+    return best
@@ -0,0 +1,118 @@
+# Digit engine for the reference solutions of the problems about the
+# decimal digits of integers that can be hundreds of thousands of digits
+# long. Converting such integers with str and int takes quadratic time,
+# and is refused outright above sys.get_int_max_str_digits() digits, so
+# the conversions here split the number in halves recursively, and only
+# hand the pieces that are small enough to str and int.
+
+import decimal
+import re
+from functools import lru_cache
+from operator import lt, ne
+
+# Pieces up to these sizes are converted directly.
+small_bits = 3000
+small_digits = 1000
+
+# Split points are these sizes times a power of two, so that only a few
+# powers are ever needed, and those are computed once and cached.
+
+def __split_point(size, small):
+    h = small
+    while 2 * h < size:
+        h *= 2
+    return h
+
+__context = decimal.Context(prec = decimal.MAX_PREC, Emax = decimal.MAX_EMAX, Emin = decimal.MIN_EMIN)
+
+@lru_cache(maxsize = None)
+def __power_of_two(k):
+    return __context.power(decimal.Decimal(2), k)
+
+@lru_cache(maxsize = None)
+def __power_of_ten(k):
+    return 10 ** k
+
+# Integer to digits: the halves are split off by the bits, which is free,
+# and recombined as decimal numbers, whose multiplication is fast enough
+# to make the whole conversion subquadratic. The decimal number is then
+# written out in linear time.
+
+def __to_decimal(n, bits):
+    if bits <= small_bits:
+        return decimal.Decimal(n)
+    h = __split_point(bits, small_bits)
+    hi = n >> h
+    lo = __to_decimal(n - (hi << h), h)
+    return __context.add(__context.multiply(__to_decimal(hi, bits - h), __power_of_two(h)), lo)
+
+def decimal_string(n):
+    if n < 0:
+        return '-' + decimal_string(-n)
+    if n.bit_length() <= small_bits:
+        return str(n)
+    return str(__to_decimal(n, n.bit_length()))
+
+# Digits to integer: the halves of the string are converted separately,
+# and combined with one multiplication by a cached power of ten.
+
+def from_digits(s):
+    if len(s) <= small_digits:
+        return int(s)
+    h = __split_point(len(s), small_digits)
+    return from_digits(s[:-h]) * __power_of_ten(h) + from_digits(s[-h:])
+
+# The digits of n from the highest to the lowest as the values 0 to 9
+# in a bytes object, for the comparisons between neighbouring digits.
+
+__digit_values = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+def digit_array(n):
+    return decimal_string(n).encode('ascii').translate(__digit_values)
+
+def digit_sum(n):
+    s = decimal_string(n)
+    return sum(d * s.count(str(d)) for d in range(1, 10))
+
+# The lengths of the maximal runs of at least two equal digits, and
+# whether each run is at the lowest end of the number.
+
+__runs = re.compile(r'(\d)\1+')
+
+def digit_runs(n):
+    s = decimal_string(n)
+    return [(m.end() - m.start(), m.end() == len(s)) for m in __runs.finditer(s)]
+
+# A zigzag number has no two equal neighbouring digits, and its steps up
+# between neighbouring digits strictly alternate with its steps down.
+
+def is_zigzag(n):
+    d = digit_array(n)
+    if len(d) < 2:
+        return True
+    if not all(map(ne, d, d[1:])):
+        return False
+    ups = bytes(map(lt, d, d[1:]))
+    return ups == (bytes([ups[0], 1 - ups[0]]) * len(ups))[:len(ups)]
+
+# The next zigzag number is found by increasing the lowest digit that
+# can be increased without breaking the zigzag, by the smallest amount,
+# and filling in the digits below it with the smallest completion. After
+# a step down, that is the pattern 0101..., and after a step up, the
+# next higher digit followed by that pattern. The first step may go
+# either way, so the second digit may also jump over the first one.
+
+def next_zigzag(n):
+    s = decimal_string(n)
+    d = s.encode('ascii').translate(__digit_values)
+    for i in range(len(d) - 1, -1, -1):
+        v = d[i] + 1
+        if i == 1 and v == d[0]:
+            v += 1
+        if v <= 9 and (i < 2 or v != d[i - 1] and (d[i] > d[i - 1]) == (v > d[i - 1])):
+            break
+    else:
+        return from_digits(('10' * len(s))[:len(s) + 1])
+    rest = len(d) - 1 - i
+    tail = (str(v + 1) if i > 0 and v < d[i - 1] else '') + '01' * rest
+    return from_digits(s[:i] + str(v) + tail[:rest])
@@ -0,0 +1,141 @@
+# Search engine for the reference solutions of the game and puzzle
+# problems that are solved by exhaustive search. Each search function
+# maps a canonical encoding of the position to its value, and is wrapped
+# in a transposition table of bounded size, so that the positions that
+# are reached along different paths, or again in a later test case, are
+# evaluated only once. Positions are encoded as tuples or as bitboards,
+# that is, integers whose bits tell which squares are occupied.
+
+from functools import lru_cache
+from math import isqrt
+
+# Maximum number of positions kept in each transposition table, the
+# least recently used positions being evicted first.
+table_size = 2**20
+
+__tables = []
+__searches = dict()
+
+# The table of each search is created at the first call of that search,
+# with the table_size at that moment. The module name of the search is
+# then bound to the table itself, so that the recursive calls, which go
+# through that name, do not pass through the wrapper below.
+
+def transposition_table(f):
+    def search(*args):
+        table = lru_cache(maxsize = table_size)(f)
+        __tables.append(table)
+        globals()[f.__name__] = table
+        return table(*args)
+    __searches[f.__name__] = search
+    return search
+
+# The numbers of table hits and of evaluated positions of each search,
+# for reporting how well the transposition tables work.
+
+def search_stats():
+    return {t.__wrapped__.__name__: (t.cache_info().hits, t.cache_info().misses) for t in __tables}
+
+# Discard all the tables, so that each search creates its table again at
+# its next call, with the table_size at that moment.
+
+def clear_tables():
+    __tables.clear()
+    globals().update(__searches)
+
+# Subtract a square: n is cold if no square can be subtracted from it to
+# leave a cold number. Each newly found cold number c makes every c + k*k
+# hot, so that the work is proportional to the number of cold numbers,
+# which thin out quickly, times the square root of the table size. The
+# table is extended by doubling whenever a larger n is needed.
+
+__heat = bytearray(1)
+__cold = [0]
+
+def is_hot(n):
+    global __heat
+    if n >= len(__heat):
+        size = max(n + 1, 2 * len(__heat))
+        heat = __heat + bytearray(size - len(__heat))
+        for c in __cold:
+            k = isqrt(len(__heat) - c - 1) + 1
+            while c + k * k < size:
+                heat[c + k * k] = 1
+                k += 1
+        for m in range(len(__heat), size):
+            if not heat[m]:
+                __cold.append(m)
+                k = 1
+                while m + k * k < size:
+                    heat[m + k * k] = 1
+                    k += 1
+        __heat = heat
+    return __heat[n] == 1
+
+# Crag: the score of three dice in each of the thirteen categories, and
+# the best total score when every roll is put into a different category.
+# The order of the rolls does not matter, so the remaining rolls are
+# kept sorted to make the positions that differ only in that order the
+# same position, along with the bitmask of the categories already used.
+
+@lru_cache(maxsize = None)
+def crag_scores(dice):
+    d = sorted(dice)
+    total, pair = sum(d), d[0] == d[1] or d[1] == d[2]
+    return tuple([50 if pair and total == 13 else 0, 26 if total == 13 else 0,
+                  25 if d[0] == d[2] else 0] +
+                 [20 if d == s else 0 for s in ([1, 2, 3], [4, 5, 6], [1, 3, 5], [2, 4, 6])] +
+                 [p * d.count(p) for p in range(1, 7)])
+
+# A category that none of the remaining rolls scores anything in is a
+# free place to throw away a roll, so when such a category exists, the
+# other categories where the current roll scores zero need not be tried.
+
+@lru_cache(maxsize = None)
+def crag_scoring_mask(dice):
+    return sum(1 << i for (i, score) in enumerate(crag_scores(dice)) if score > 0)
+
+@transposition_table
+def crag_search(rolls, used):
+    if not rolls:
+        return 0
+    useful = used
+    for r in rolls:
+        useful |= crag_scoring_mask(r)
+    spare = ~useful & (useful + 1) & 0x1FFF
+    best, rest = 0, rolls[1:]
+    for (i, score) in enumerate(crag_scores(rolls[0])):
+        if not used >> i & 1 and (score > 0 or not spare or spare >> i & 1):
+            best = max(best, score + crag_search(rest, used | 1 << i))
+    return best
+
+def best_crag_total(rolls):
+    return crag_search(tuple(sorted(tuple(sorted(r)) for r in rolls)), 0)
+
+# Checkers: the king at square p of the n-by-n board captures the pieces
+# whose bits are on in the bitboard. For each square, the table of jumps
+# lists the bit of the square to jump over and the square to land on.
+
+@lru_cache(maxsize = None)
+def checkers_jumps(n):
+    jumps = []
+    for x in range(n):
+        for y in range(n):
+            jumps.append([((1 << ((x + dx) * n + y + dy)), (x + 2 * dx) * n + y + 2 * dy)
+                          for (dx, dy) in [(-1, 1), (1, 1), (1, -1), (-1, -1)]
+                          if 0 <= x + 2 * dx < n and 0 <= y + 2 * dy < n])
+    return jumps
+
+@transposition_table
+def checkers_search(n, p, pieces):
+    best = 0
+    for (over, land) in checkers_jumps(n)[p]:
+        if pieces & over and not pieces >> land & 1:
+            best = max(best, 1 + checkers_search(n, land, pieces & ~over))
+    return best
+
+def max_capture(n, x, y, pieces):
+    board = 0
+    for (px, py) in pieces:
+        board |= 1 << (px * n + py)
+    return checkers_search(n, x * n + y, board)
@@ -0,0 +1,53 @@
+# Graph engine for the reference solutions of the problems about the
+# connectivity of undirected graphs. The vertices are the integers from
+# 0 to n - 1, so that everything is kept in flat lists indexed by the
+# vertex instead of dictionaries or objects of a vertex class.
+
+# Disjoint set forest with union by rank and path compression. The root
+# of each tree is its own parent, and the rank of a root is an upper
+# bound for the height of its tree, so a rank never exceeds log2(n) and
+# fits in a bytearray.
+
+def union_find(n, edges):
+    parent, rank = list(range(n)), bytearray(n)
+    for (u, v) in edges:
+        # Find both roots, halving the paths along the way.
+        while parent[u] != u:
+            parent[u] = u = parent[parent[u]]
+        while parent[v] != v:
+            parent[v] = v = parent[parent[v]]
+        if u != v:
+            if rank[u] < rank[v]:
+                u, v = v, u
+            parent[v] = u
+            if rank[u] == rank[v]:
+                rank[u] += 1
+    return parent
+
+# The root of the component of each vertex, found after all the edges
+# have been added. Since the parent of a vertex always has a smaller
+# depth, the vertices are labelled in a single pass that stops at the
+# first vertex whose parent is already labelled, after which the whole
+# path is given that label.
+
+def component_labels(n, edges):
+    parent = union_find(n, edges)
+    label = [-1] * n
+    for v in range(n):
+        path = []
+        while label[v] < 0 and parent[v] != v:
+            path.append(v)
+            v = parent[v]
+        root = label[v] if label[v] >= 0 else v
+        label[v] = root
+        for u in path:
+            label[u] = root
+    return label
+
+# Answer all the connectivity queries offline: since the edges are known
+# in advance, the graph is built first and every query then becomes the
+# comparison of two labels.
+
+def connected_pairs(n, edges, queries):
+    label = component_labels(n, edges)
+    return [label[u] == label[v] for (u, v) in queries]
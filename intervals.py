@@ -0,0 +1,61 @@
+# Interval engine for the reference solutions of the problems about
+# intervals of integers. Everything here works with the endpoints of the
+# intervals only, so that the running time depends on the number of the
+# intervals but not on how long they are or how far apart they lie.
+
+from heapq import heappush, heappop
+from itertools import compress
+from operator import sub
+
+# Total area covered by the towers (s, e, h) that stand on the same
+# baseline. The sweep goes through the distinct endpoints in ascending
+# order, and keeps the active towers in a max-heap by height. A tower
+# that has ended is removed from the heap only when it rises to the top,
+# since only the tallest active tower matters for each slab.
+
+def skyline_area(towers):
+    towers = sorted(towers)
+    xs = sorted(set(s for (s, _, _) in towers) | set(e for (_, e, _) in towers))
+    heap, area, i = [], 0, 0
+    for (x, nx) in zip(xs, xs[1:]):
+        while i < len(towers) and towers[i][0] == x:
+            heappush(heap, (-towers[i][2], towers[i][1]))
+            i += 1
+        while heap and heap[0][1] <= x:
+            heappop(heap)
+        if heap:
+            area -= heap[0][0] * (nx - x)
+    return area
+
+# Parse the comma-separated description of intervals into the list of
+# their (first, last) pairs, and format such a list back into one.
+
+def parse_intervals(description):
+    runs = []
+    for part in description.split(','):
+        if part:
+            (first, _, last) = part.partition('-')
+            runs.append((int(first), int(last or first)))
+    return runs
+
+def format_intervals(runs):
+    return ','.join(str(a) if a == b else f"{a}-{b}" for (a, b) in runs)
+
+# Split a list of runs into the integers that they contain.
+
+def expand_runs(runs):
+    result = []
+    for (a, b) in runs:
+        result.extend(range(a, b + 1))
+    return result
+
+# Merge a sorted list of integers into the runs of consecutive integers.
+# The positions where a run breaks are found by comparing the list with
+# itself shifted by one, without looping through it in Python.
+
+def merge_runs(items):
+    if not items:
+        return []
+    breaks = list(compress(range(1, len(items)), map((1).__ne__, map(sub, items[1:], items))))
+    starts, ends = [0] + breaks, [b - 1 for b in breaks] + [len(items) - 1]
+    return [(items[s], items[e]) for (s, e) in zip(starts, ends)]
@@ -0,0 +1,55 @@
+# Integer search kernel for the reference solutions of the problems that
+# look for a position in a monotone sequence of huge integers. Instead of
+# searching for the position by doubling and bisection, each of which
+# costs a multiplication of huge integers, the position is solved from a
+# closed form with the exact integer square root, which is a Newton
+# iteration that converges in a logarithmic number of steps, or located
+# with floating point logarithms and then confirmed with exact powers.
+
+from math import isqrt, log, log1p
+
+# The i:th s-gonal number, and the largest position i >= 1 whose s-gonal
+# number is at most n. The latter is the positive root of the quadratic
+# (s - 2) i**2 - (s - 4) i - 2n, rounded down, and the rounding of isqrt
+# can leave it off by one in either direction, which is then corrected.
+
+def polygonal(s, i):
+    return ((s - 2) * i * i - (s - 4) * i) // 2
+
+def polygonal_position(n, s):
+    i = max(1, ((s - 4) + isqrt((s - 4) ** 2 + 8 * (s - 2) * n)) // (2 * (s - 2)))
+    while i > 1 and polygonal(s, i) > n:
+        i -= 1
+    while polygonal(s, i + 1) <= n:
+        i += 1
+    return i
+
+def nearest_polygonal(n, s):
+    i = polygonal_position(n, s)
+    (lo, hi) = (polygonal(s, i), polygonal(s, i + 1))
+    return lo if n - lo <= hi - n else hi
+
+# The first exponents (pa, pb) in the merged order of the powers of a
+# and b, the smaller power always taking the next step, for which the
+# powers are within the given tolerance of each other. The merge is done
+# with the logarithms of the powers, and only the pairs whose logarithms
+# are close enough to possibly hit are checked with the exact powers.
+
+def hitting_powers(a, b, tolerance):
+    la, lb = log(a), log(b)
+    near = log1p(1 / tolerance)
+    pa, pb = 1, 1
+    while True:
+        (x, y) = (pa * la, pb * lb)
+        if abs(x - y) <= near + 1e-12 * max(x, y):
+            (pow_a, pow_b) = (a ** pa, b ** pb)
+            if abs(pow_a - pow_b) * tolerance <= min(pow_a, pow_b):
+                return (pa, pb)
+            if pow_a < pow_b:
+                pa += 1
+            else:
+                pb += 1
+        elif x < y:
+            pa += 1
+        else:
+            pb += 1
@@ -0,0 +1,95 @@
+# List scan kernel for the reference solutions of the problems that ask,
+# for each element of a list, something about the elements before or
+# after it. Instead of looking at all those other elements separately
+# for each element, which takes quadratic time, each scan keeps only the
+# elements that can still matter to the elements that come later.
+
+from bisect import bisect_left, insort
+
+# Up to this k, the k smallest elements are kept in a sorted list.
+sorted_limit = 2000
+
+# Monotonic stack: the position of the nearest strictly smaller element
+# before each element, or -1 if there is none. The stack holds the
+# positions of the elements that are smaller than everything after them
+# so far, since only those can be the answer for a later element, so
+# each position is pushed and popped at most once.
+
+def previous_smaller(items):
+    result, stack = [], []
+    for (i, x) in enumerate(items):
+        while stack and items[stack[-1]] >= x:
+            stack.pop()
+        result.append(stack[-1] if stack else -1)
+        stack.append(i)
+    return result
+
+# The same to the other direction, with len(items) if there is none.
+
+def next_smaller(items):
+    n = len(items)
+    return [n - 1 - j for j in reversed(previous_smaller(items[::-1]))]
+
+# Fenwick tree over the ranks of the elements: for each element in turn,
+# the number of strictly smaller elements before it. The ranks are the
+# positions of the elements in the sorted list of the distinct elements,
+# so that the elements need only be comparable, and the counts are
+# generated lazily so that the scan can stop at the element it needs.
+
+def preceding_smaller_counts(items):
+    values = sorted(set(items))
+    tree = [0] * (len(values) + 1)
+    for x in items:
+        r = bisect_left(values, x)
+        # Count the elements of ranks 1 to r, that is, the smaller ones.
+        i, count = r, 0
+        while i > 0:
+            count += tree[i]
+            i &= i - 1
+        yield count
+        # Add this element to its rank r + 1.
+        i = r + 1
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+# The position of the first element that has at least k strictly smaller
+# elements before it, or -1 if there is none. The element has them if
+# the largest of the k smallest elements before it is smaller than it.
+# For small k, these k elements are kept in a sorted list, into which
+# each insertion moves at most k elements in one memory copy. For larger
+# k, the counts come from the Fenwick tree instead.
+
+def first_with_smaller_predecessors(items, k):
+    if k > sorted_limit:
+        for (i, count) in enumerate(preceding_smaller_counts(items)):
+            if count >= k:
+                return i
+        return -1
+    smallest = []
+    for (i, x) in enumerate(items):
+        if len(smallest) < k:
+            insort(smallest, x)
+        elif smallest[-1] < x:
+            return i
+        elif x < smallest[-1]:
+            smallest.pop()
+            insort(smallest, x)
+    return -1
+
+# The median of three elements is found with two or three comparisons,
+# instead of calling min and max, or sorting the three elements, both of
+# which are slower in Python than the comparisons themselves.
+
+def medians_of_three(a, b, c):
+    return [(y if y < z else (z if x < z else x)) if x < y else (x if x < z else (z if y < z else y))
+            for (x, y, z) in zip(a, b, c)]
+
+# The medians of the consecutive triples that end in each position after
+# the first two, and of the disjoint triples that the list splits into.
+
+def running_medians(items):
+    return medians_of_three(items, items[1:], items[2:])
+
+def triple_medians(items):
+    return medians_of_three(items[0::3], items[1::3], items[2::3])
@@ -0,0 +1,232 @@
+# Number theory kernel shared by the reference solutions of the problems
+# that need primes, prime factorizations or sums of divisors. Everything
+# here works with exact integer arithmetic, and caches whatever it has
+# computed so that repeated queries become cheap.
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import compress
+from math import gcd, isqrt, log2
+import random
+
+# Largest number for which the table of smallest prime factors will be
+# grown. Numbers past this limit are factored with Pollard's rho.
+spf_limit = 2**22
+
+# Sieve of Eratosthenes for the list of all primes up to n.
+
+def primes_up_to(n):
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for p in range(2, isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p*p::p] = bytes(len(range(p*p, n + 1, p)))
+    return list(compress(range(n + 1), sieve))
+
+# Segmented sieve for the list of primes p with lo <= p < hi, needing
+# memory only for the sieving primes and the segment itself.
+
+def primes_in_range(lo, hi):
+    lo = max(lo, 2)
+    if hi <= lo:
+        return []
+    segment = bytearray([1]) * (hi - lo)
+    for p in primes_up_to(isqrt(hi - 1)):
+        start = max(p * p, (lo + p - 1) // p * p)
+        segment[start - lo::p] = bytes(len(range(start, hi, p)))
+    return list(compress(range(lo, hi), segment))
+
+# The table of smallest prime factors, grown on demand by doubling. The
+# primes are processed in descending order so that the smallest prime
+# factor of each number is the one that gets written last.
+
+__spf = array('I', [0, 1])
+
+def __grow_spf(n):
+    global __spf
+    size = min(max(n + 1, 2 * len(__spf)), spf_limit)
+    spf = array('I', range(size))
+    for p in reversed(primes_up_to(isqrt(size - 1))):
+        spf[p*p::p] = array('I', [p]) * len(range(p*p, size, p))
+    __spf = spf
+
+def smallest_prime_factor(n):
+    if n >= len(__spf) and n < spf_limit:
+        __grow_spf(n)
+    if n < len(__spf):
+        return __spf[n]
+    return min(factorize(n))
+
+# Deterministic Miller-Rabin test for all n < 3.3 * 10**24, and a strong
+# probable prime test for anything larger than that.
+
+__witnesses = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+def is_prime(n):
+    if n < len(__spf):
+        return n > 1 and __spf[n] == n
+    for p in __witnesses:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in __witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+# Brent's variant of Pollard's rho, returning some nontrivial factor of
+# the composite number n.
+
+def __pollard_brent(n):
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randint(1, n - 1), rng.randint(1, n - 1), 128
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+__small_primes = primes_up_to(1000)
+
+def __factor_into(n, result):
+    while n > 1 and n < spf_limit:
+        p = smallest_prime_factor(n)
+        result.append(p)
+        n //= p
+    if n == 1:
+        return
+    if is_prime(n):
+        result.append(n)
+    else:
+        d = __pollard_brent(n)
+        __factor_into(d, result)
+        __factor_into(n // d, result)
+
+# The sorted list of prime factors of n, each prime factor appearing as
+# many times as it divides n.
+
+def factorize(n):
+    result = []
+    if n >= spf_limit:
+        for p in __small_primes:
+            while n % p == 0:
+                result.append(p)
+                n //= p
+    __factor_into(n, result)
+    result.sort()
+    return result
+
+# The prime factorization of n as a list of (prime, exponent) pairs.
+
+def factorization(n):
+    result = []
+    for p in factorize(n):
+        if result and result[-1][0] == p:
+            result[-1] = (p, result[-1][1] + 1)
+        else:
+            result.append((p, 1))
+    return result
+
+# The sum of all positive divisors of n, computed from its factorization
+# and cached, since the divisor sums of the same numbers tend to be
+# needed over and over.
+
+@lru_cache(maxsize = 2**16)
+def divisor_sum(n):
+    total = 1
+    for (p, e) in factorization(n):
+        total *= (p ** (e + 1) - 1) // (p - 1)
+    return total
+
+# Integer k:th root of n, the largest integer x with x**k <= n, computed
+# with Newton's iteration that starts above the root and descends.
+
+def iroot(n, k):
+    if n < 0:
+        raise ValueError("iroot of a negative number")
+    if n < 2 or k == 1:
+        return n
+    if k == 2:
+        return isqrt(n)
+    bits = n.bit_length()
+    if k >= bits:
+        return 1
+    # Start from a floating point estimate nudged slightly upwards, so
+    # that only a few iterations are needed even for huge numbers.
+    e = log2(n) / k
+    if e < 30:
+        x = int(2 ** e) + 2
+    else:
+        x = (int(2 ** (e - int(e) + 30)) + 2) << (int(e) - 30)
+        x += x >> 20
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+# Whether n is a perfect k:th power. For prime k, n must also be a k:th
+# power residue modulo every prime q = 1 (mod k), which quickly rules
+# out most numbers before the expensive exact root is computed.
+
+__residue_moduli = dict()
+
+def __moduli_for(k):
+    if k not in __residue_moduli:
+        qs, q = [], 2 * k + 1
+        while len(qs) < 4:
+            if is_prime(q):
+                qs.append(q)
+            q += 2 * k
+        __residue_moduli[k] = qs
+    return __residue_moduli[k]
+
+def is_kth_power(n, k):
+    if k > 2 and is_prime(k):
+        for q in __moduli_for(k):
+            r = n % q
+            if r != 0 and pow(r, (q - 1) // k, q) != 1:
+                return False
+    return iroot(n, k) ** k == n
+
+# The primes up to n, from a cache that is extended by doubling. Only
+# the new range past the largest cached prime is sieved, with the
+# segmented sieve, instead of sieving again everything from the start.
+
+__prime_list = primes_up_to(1000)
+
+def cached_primes(n):
+    if __prime_list[-1] < n:
+        __prime_list.extend(primes_in_range(__prime_list[-1] + 1, max(n, 2 * __prime_list[-1]) + 1))
+    return __prime_list[:bisect_left(__prime_list, n + 1)]
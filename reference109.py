@@ -0,0 +1,630 @@
+# Reference solutions for some of the problems in the collection
+# "109 Python Problems for CCPS 109", written for speed rather than
+# for simplicity. These serve as fast baselines that student solutions
+# can be benchmarked against with "python3 tester109.py --benchmark",
+# and can be tested themselves with "python3 tester109.py --reference".
+
+from math import gcd
+from heapq import heappush, heappop
+from bisect import bisect_left, bisect_right
+from math import isqrt
+from fractions import Fraction
+from numtheory import factorize, factorization, divisor_sum, cached_primes, is_kth_power
+import cards
+import automaton
+import wordindex
+import intervals
+import games
+import subsetsum
+import graphs
+import textstream
+import digits
+import intsearch
+import sequences
+import strings
+import listscan
+import simulation
+
+# Two squares do not intersect if one of them ends before the other
+# one begins, either horizontally or vertically.
+
+def squares_intersect(s1, s2):
+    (x1, y1, r1), (x2, y2, r2) = s1, s2
+    return not (x1 + r1 < x2 or x2 + r2 < x1 or y1 + r1 < y2 or y2 + r2 < y1)
+
+# Sweep line over the x-intervals of the disks. Each disk enters the
+# active set at x - r, and the disks whose interval has ended by then
+# are removed from the active set using a heap of their right ends.
+
+def count_overlapping_disks(disks):
+    events = sorted((x - r, x + r, y, r) for (x, y, r) in disks)
+    active, ends, count = dict(), [], 0
+    for (i, (left, right, y, r)) in enumerate(events):
+        while ends and ends[0][0] < left:
+            del active[heappop(ends)[1]]
+        x = left + r
+        for (x2, y2, r2) in active.values():
+            if (x - x2) ** 2 + (y - y2) ** 2 <= (r + r2) ** 2:
+                count += 1
+        active[i] = (x, y, r)
+        heappush(ends, (right, i))
+    return count
+
+# Direction of the line through two distinct points, normalized so that
+# all the collinear pairs of points have the same direction vector.
+
+def __direction(p1, p2):
+    dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+    g = gcd(dx, dy)
+    dx, dy = dx // g, dy // g
+    if dx < 0 or (dx == 0 and dy < 0):
+        dx, dy = -dx, -dy
+    return dx, dy
+
+# For each point, count the other points in each direction from it
+# with a hash table, so that collinear points fall into the same bucket.
+
+def line_with_most_points(points):
+    best = 2 if len(points) > 1 else len(points)
+    for (i, p1) in enumerate(points):
+        if best >= len(points) - i:
+            break
+        counts = dict()
+        for p2 in points[i + 1:]:
+            d = __direction(p1, p2)
+            counts[d] = counts.get(d, 1) + 1
+        best = max(best, max(counts.values(), default = 1))
+    return best
+
+# Every line through at least two of the points is uniquely identified
+# by its normalized direction and the constant term of its equation.
+
+def count_distinct_lines(points):
+    lines = set()
+    for (i, p1) in enumerate(points):
+        for p2 in points[i + 1:]:
+            (dx, dy) = __direction(p1, p2)
+            lines.add((dx, dy, dx * p1[1] - dy * p1[0]))
+    return len(lines)
+
+# A point is removed in the round that follows the removal of all the
+# points that dominate it, so the answer is the length of the longest
+# chain of dominating points. Processing the points in descending order
+# of x, tails[k] holds the largest y that ends such a chain of length
+# k + 1, negated to keep the list ascending for bisection.
+
+def count_maximal_layers(points):
+    points = sorted(points, reverse = True)
+    tails, i = [], 0
+    while i < len(points):
+        j = i
+        while j < len(points) and points[j][0] == points[i][0]:
+            j += 1
+        # Points with equal x do not dominate each other.
+        updates = [(bisect_left(tails, -y), -y) for (_, y) in points[i:j]]
+        for (k, ny) in updates:
+            if k == len(tails):
+                tails.append(ny)
+            elif ny < tails[k]:
+                tails[k] = ny
+        i = j
+    return len(tails)
+
+# Prime factorization from the shared table of smallest prime factors,
+# with Pollard's rho for the numbers that are too large for the table.
+
+def prime_factors(n):
+    return factorize(n)
+
+# Legendre's formula gives the exponent of each prime p in n! directly
+# as the sum of n // p**k over all k, without computing n! at all.
+
+def factoring_factorial(n):
+    result = []
+    for p in cached_primes(n):
+        e, pk = 0, p
+        while pk <= n:
+            e += n // pk
+            pk *= p
+        result.append((p, e))
+    return result
+
+def aliquot_sequence(n, giveup = 100):
+    result, seen = [n], {n}
+    while len(result) < giveup and n > 0:
+        n = divisor_sum(n) - n
+        if n in seen:
+            break
+        result.append(n)
+        seen.add(n)
+    return result
+
+# Every prime p = 1 (mod 4) is the norm of some Gaussian prime x + yi,
+# found with the Hermite-Serret algorithm from a square root of -1 mod p.
+
+def __gaussian_prime(p):
+    c = 2
+    while pow(c, (p - 1) // 2, p) != p - 1:
+        c += 1
+    a, b = p, pow(c, (p - 1) // 4, p)
+    while b * b > p:
+        a, b = b, a % b
+    return b, isqrt(p - b * b)
+
+def __gaussian_mul(u, v):
+    return u[0] * v[0] - u[1] * v[1], u[0] * v[1] + u[1] * v[0]
+
+# All the ways to write n as a sum of two squares are the Gaussian
+# integers whose norm is n, generated from the prime factorization of n
+# instead of searching through the possible squares.
+
+def sum_of_two_squares(n):
+    reps = [(1, 0)]
+    for (p, e) in factorization(n):
+        if p == 2:
+            for _ in range(e):
+                reps = [__gaussian_mul(u, (1, 1)) for u in reps]
+        elif p % 4 == 3:
+            if e % 2 == 1:
+                return None
+            reps = [(u[0] * p ** (e // 2), u[1] * p ** (e // 2)) for u in reps]
+        else:
+            (x, y) = __gaussian_prime(p)
+            powers, conj = [(1, 0)], [(1, 0)]
+            for _ in range(e):
+                powers.append(__gaussian_mul(powers[-1], (x, y)))
+                conj.append(__gaussian_mul(conj[-1], (x, -y)))
+            reps = [__gaussian_mul(u, __gaussian_mul(powers[k], conj[e - k]))
+                    for u in reps for k in range(e + 1)]
+    best = None
+    for (a, b) in reps:
+        a, b = max(abs(a), abs(b)), min(abs(a), abs(b))
+        if b > 0 and (best is None or a > best[0]):
+            best = (a, b)
+    return best
+
+# If n = b**e, then also n = (b**(e/p))**p for every prime factor p of
+# e, so only the prime exponents up to the bit length of n need to be
+# tried, each with an exact integer root.
+
+def is_perfect_power(n):
+    return any(is_kth_power(n, p) for p in cached_primes(n.bit_length()))
+
+# The sequence for each pair (a, b) is extended only as far as needed,
+# and kept around along with the positions of its values, since the
+# same sequences are queried for one value after another.
+
+__md_cache = dict()
+
+def md(a, b, n):
+    (seq, pos) = __md_cache.setdefault((a, b), ([1], {1: 0}))
+    while n not in pos:
+        v = seq[-1]
+        if v // a != 0 and v // a not in pos:
+            v = v // a
+        else:
+            v = b * v
+        pos[v] = len(seq)
+        seq.append(v)
+    return pos[n]
+
+# Sweep over the endpoints of the towers with a lazily pruned max-heap.
+
+def manhattan_skyline(towers):
+    return intervals.skyline_area(towers)
+
+# Both interval problems convert between the description string and the
+# list of (first, last) runs, and only then to or from the integers.
+
+def expand_intervals(description):
+    return intervals.expand_runs(intervals.parse_intervals(description))
+
+def collapse_intervals(items):
+    return intervals.format_intervals(intervals.merge_runs(items))
+
+# The subset sum style problems with the bitsets of module subsetsum.
+
+def sum_of_distinct_cubes(n):
+    return subsetsum.distinct_cubes(n)
+
+# The sums are counted from the bitset of all pairwise sums, and only the
+# products that are not also sums need to be counted separately.
+
+def count_distinct_sums_and_products(items):
+    sums = subsetsum.pair_sums(items)
+    products = set()
+    for (i, a) in enumerate(items):
+        products.update(map(a.__mul__, items[i:]))
+    products.difference_update(subsetsum.bit_positions(sums))
+    return subsetsum.popcount(sums) + len(products)
+
+# The chosen fractions are a set, since the condition for each prefix of
+# the list depends only on which fractions are in that prefix, and the
+# sets that can be grown one fraction at a time are represented as
+# bitmasks of the indices of the fractions.
+
+def fractional_fit(fs):
+    slots = [None] + [[1 << (a * k // b) for (a, b) in fs] for k in range(1, len(fs) + 1)]
+    def valid(mask, k):
+        used, slot = 0, slots[k]
+        while mask:
+            i = (mask & -mask).bit_length() - 1
+            if used & slot[i]:
+                return False
+            used |= slot[i]
+            mask &= mask - 1
+        return True
+    return subsetsum.longest_subset_chain(len(fs), valid)
+
+# The greedy change asked for needs no search, only a division for each
+# denomination in descending order.
+
+def give_change(amount, coins):
+    result = []
+    for c in coins:
+        (k, amount) = divmod(amount, c)
+        result.extend([c] * k)
+    return result
+
+# The game and puzzle searches of module games, with their transposition
+# tables shared between all the test cases.
+
+def subtract_square(queries):
+    return [games.is_hot(n) for n in queries]
+
+def optimal_crag_score(rolls):
+    return games.best_crag_total(rolls)
+
+def max_checkers_capture(n, x, y, pieces):
+    return games.max_capture(n, x, y, pieces)
+
+def search_stats():
+    return games.search_stats()
+
+# These two need no search at all. The tiles form a cycle if each tile
+# starts with the pips that its predecessor ends with, and the knight
+# can make the jump if the absolute differences of the coordinates are
+# some permutation of its offsets.
+
+def domino_cycle(tiles):
+    return all(t1[1] == t2[0] for (t1, t2) in zip(tiles, tiles[1:] + tiles[:1]))
+
+def knight_jump(knight, start, end):
+    return sorted((abs(a - b) for (a, b) in zip(start, end)), reverse = True) == list(knight)
+
+# Tabs are expanded by the string methods in C. The stream version is
+# used by the throughput benchmark for texts too large to hold at once.
+
+def detab(text, n = 8, sub = ' '):
+    return textstream.detab(text, n, sub)
+
+def detab_stream(chunks, n = 8, sub = ' '):
+    return textstream.detab_stream(chunks, n, sub)
+
+# The position of the nearest polygonal number is solved from the closed
+# form with isqrt, and the powers are merged by their logarithms, with
+# only the near misses checked with the exact powers.
+
+def nearest_polygonal_number(n, s):
+    return intsearch.nearest_polygonal(n, s)
+
+def hitting_integer_powers(a, b, tolerance = 100):
+    return intsearch.hitting_powers(a, b, tolerance)
+
+# The sequences are computed once up to the farthest position queried,
+# and every later query within that prefix is a lookup.
+
+def recaman(n):
+    return sequences.terms('recaman', n)[:n].tolist()
+
+def van_eck(n):
+    return sequences.terms('van_eck', n + 1)[n]
+
+def calkin_wilf(n):
+    return Fraction(*sequences.fusc_pair(n))
+
+def kempner(n):
+    return sequences.terms('kempner', n)[n - 1].limit_denominator(1000)
+
+# The column of n in the Wythoff array is the position of the smallest
+# Fibonacci number in the Zeckendorf representation of n, and shifting
+# that representation down by the column gives the first element of the
+# row, from which the row itself follows in closed form.
+
+def wythoff_array(n):
+    fib = sequences.terms('fibonacci', 2)
+    while fib[-1] <= n:
+        fib = sequences.terms('fibonacci', len(fib) + 1)
+    used, m = [], n
+    while m > 0:
+        i = bisect_right(fib, m) - 1
+        used.append(i)
+        m -= fib[i]
+    col = used[-1]
+    first = sum(fib[i - col] for i in used)
+    return (sequences.wythoff_row(first), col)
+
+# The digit in position n is in the block of the k-digit numbers that
+# contains that position, found from the positions where blocks begin.
+
+def counting_series(n):
+    k = 1
+    while sequences.terms('digit_blocks', k + 1)[k] <= n:
+        k += 1
+    offset = n - sequences.terms('digit_blocks', k)[k - 1]
+    return int(str(10 ** (k - 1) + offset // k)[offset % k])
+
+def sequence_memory():
+    return sequences.memory_usage()
+
+def persist_sequences(directory):
+    sequences.cache_dir = directory
+
+# Manacher's algorithm finds the longest palindrome around every center
+# in linear time, instead of checking each substring separately.
+
+def longest_palindrome(text):
+    return strings.longest_palindrome(text)
+
+# The lengths of the Fibonacci words are the Fibonacci numbers, so the
+# position descends through the same cached numbers as wythoff_array.
+
+def fibonacci_word(k):
+    fib = sequences.terms('fibonacci', 2)
+    while fib[-1] <= k:
+        fib = sequences.terms('fibonacci', len(fib) + 1)
+    return strings.fibonacci_word(k, fib)
+
+# The nearest smaller elements to both directions are found with one
+# monotonic stack scan each, instead of searching outwards from each
+# element, which takes quadratic time when the smaller ones are far.
+
+def nearest_smaller(items):
+    left, right = listscan.previous_smaller(items), listscan.next_smaller(items)
+    result = []
+    for (i, x) in enumerate(items):
+        (j, k) = (left[i], right[i])
+        if j < 0 and k == len(items):
+            result.append(x)
+        elif j < 0 or k < len(items) and k - i < i - j:
+            result.append(items[k])
+        elif k == len(items) or i - j < k - i:
+            result.append(items[j])
+        else:
+            result.append(min(items[j], items[k]))
+    return result
+
+# An element is a dominator if it is greater than the running maximum
+# of the elements after it, so one pass from the right is enough.
+
+def count_dominators(items):
+    if not items:
+        return 0
+    count, top = 1, items[-1]
+    for x in reversed(items):
+        if x > top:
+            count += 1
+            top = x
+    return count
+
+# The smallest elements so far are kept in a sorted list, or counted
+# with a Fenwick tree when there are too many of them to keep sorted.
+
+def first_preceded_by_smaller(items, k = 1):
+    i = listscan.first_with_smaller_predecessors(items, k)
+    return items[i] if i >= 0 else None
+
+def running_median_of_three(items):
+    return items[:2] + listscan.running_medians(items)
+
+def tukeys_ninthers(items):
+    while len(items) > 1:
+        items = listscan.triple_medians(items)
+    return items[0]
+
+# The state problems move their states with the simulation engine, which
+# updates each state in place in constant time per move.
+
+def bulgarian_solitaire(piles, k):
+    return simulation.bulgarian_moves(piles, k)
+
+def spread_the_coins(piles, left, right):
+    return simulation.topple(piles, left, right)
+
+# The pairs are removed with a stack, since removing one pair can only
+# make the elements on its two sides the next pair.
+
+def iterated_remove_pairs(items):
+    stack = []
+    for x in items:
+        if stack and stack[-1] == x:
+            stack.pop()
+        else:
+            stack.append(x)
+    return stack
+
+# The remaining elements form a doubly linked list in two flat lists
+# indexed by position, and the elements are visited in ascending order
+# through their positions, skipping those that have already been removed.
+
+def eliminate_neighbours(items):
+    n = len(items)
+    prev, succ = list(range(-1, n - 1)), list(range(1, n + 1))
+    pos, removed = [0] * (n + 1), bytearray(n)
+    for (i, x) in enumerate(items):
+        pos[x] = i
+    count = 0
+    for x in range(1, n + 1):
+        i = pos[x]
+        if removed[i]:
+            continue
+        count += 1
+        (j, k) = (prev[i], succ[i])
+        if j < 0 and k == n:
+            return count
+        if k == n or j >= 0 and items[j] > items[k]:
+            k = j
+        if items[i] == n or items[k] == n:
+            return count
+        for i in (i, k):
+            removed[i] = 1
+            if prev[i] >= 0:
+                succ[prev[i]] = succ[i]
+            if succ[i] < n:
+                prev[succ[i]] = prev[i]
+    return count
+
+# The fractions are reduced once, after which each step is an exact
+# divisibility test and integer arithmetic, instead of multiplying with
+# each Fraction in turn. A program that starts repeating its states is
+# detected with Brent's algorithm and the rest of its states copied.
+
+def fractran(n, prog, giveup = 1000):
+    prog = [(a // gcd(a, b), b // gcd(a, b)) for (a, b) in prog]
+    def step(n):
+        for (a, b) in prog:
+            if n % b == 0:
+                return n // b * a
+        return None
+    return simulation.trajectory(n, step, giveup)
+
+# Bidirectional breadth first search, kept for the later queries from the
+# same start or to the same end. Since the predecessors of m by the
+# moves 3n + 1 and n // 2 are (m - 1) / 3 and 2m, 2m + 1, the search from
+# the end runs through the same graph backwards.
+
+def __collatzy_forward(n):
+    return (3 * n + 1, n // 2)
+
+def __collatzy_backward(m):
+    return (2 * m, 2 * m + 1, (m - 1) // 3) if m % 3 == 1 else (2 * m, 2 * m + 1)
+
+def collatzy_distance(start, end):
+    return simulation.shortest_distance(start, end, __collatzy_forward, __collatzy_backward)
+
+# The shape is followed backwards from 1, where the predecessor of m by
+# a step down is 2m, and by a step up is (m - 1) / 3 if that is an odd
+# integer, since only the odd numbers step up.
+
+def ztalloc(shape):
+    n = 1
+    for c in reversed(shape):
+        if c == 'd':
+            n = 2 * n
+        elif n % 6 == 4:
+            n = (n - 1) // 3
+        else:
+            return None
+    return n
+
+# Union-find over the bridges, after which the queries are answered
+# offline by comparing the component labels of the two islands.
+
+def connected_islands(n, bridges, queries):
+    return graphs.connected_pairs(n, bridges, queries)
+
+# Depth first search over the states of the Aho-Corasick automaton of
+# the tabu patterns, which never enters a state that has no valid
+# completion, instead of checking every prefix against every pattern.
+
+def forbidden_substrings(letters, n, tabu):
+    return list(automaton.strings_avoiding(sorted(letters), n, tabu))
+
+# The words of each length are indexed once for the given word list and
+# distance function, after which each query scans all the words of its
+# length at once with the columns of their letters.
+
+def autocorrect_word(word, words, df):
+    return wordindex.autocorrect_words([word], words, df)[0]
+
+# Both queries are answered from indexes of the word list that are built
+# at the first query: intersections of the bitsets of the words with the
+# given letter in the given position, and the words grouped by shape.
+
+def possible_words(words, pattern):
+    return wordindex.hangman_matches(words, pattern)
+
+def words_with_given_shape(words, shape):
+    return wordindex.words_of_shape(words, shape)
+
+# The card problems convert each hand into a 52-bit mask, and evaluate
+# the suits of that mask with the precomputed tables of module cards.
+
+def hand_is_badugi(hand):
+    return cards.badugi_flags([cards.encode_hand(hand)])[0]
+
+def bridge_hand_shape(hand):
+    return cards.hand_shapes([cards.encode_hand(hand)])[0]
+
+def bridge_hand_shorthand(hand):
+    return cards.shorthands([cards.encode_hand(hand)])[0]
+
+def losing_trick_count(hand):
+    return cards.losing_trick_counts([cards.encode_hand(hand)])[0]
+
+def milton_work_point_count(hand, trump = 'notrump'):
+    return cards.point_counts([cards.encode_hand(hand)], [trump])[0]
+
+def hand_shape_distribution(hands):
+    result = dict()
+    for shape in cards.hand_shapes(cards.encode_hands(hands)):
+        shape = tuple(sorted(shape, reverse = True))
+        result[shape] = result.get(shape, 0) + 1
+    return result
+
+def winning_card(played, trump = None):
+    return cards.decode_card(cards.trick_winner([cards.encode_card(c) for c in played], trump))
+
+def ryerson_letter_grade(n):
+    if n < 50:
+        return 'F'
+    elif n > 89:
+        return 'A+'
+    elif n > 84:
+        return 'A'
+    elif n > 79:
+        return 'A-'
+    return "DCB"[n // 10 - 5] + ("-" if n % 10 < 3 else ("+" if n % 10 > 6 else ""))
+
+# The digits of the huge numbers of the stress tests are written out
+# with the subquadratic conversion of the digits module.
+
+def is_cyclops(n):
+    s = digits.decimal_string(n)
+    return len(s) % 2 == 1 and s[len(s) // 2] == '0' and s.count('0') == 1
+
+__even_digits = set('02468')
+
+def only_odd_digits(n):
+    return __even_digits.isdisjoint(digits.decimal_string(n))
+
+# Each carry reduces the digit sum of a + b by exactly nine from the sum
+# of the digit sums of a and b, so the carries need not be simulated.
+
+def count_carries(a, b):
+    return (digits.digit_sum(a) + digits.digit_sum(b) - digits.digit_sum(a + b)) // 9
+
+# The runs of equal digits are found with a regular expression instead
+# of looping through the digits, and the zigzag property is checked by
+# comparing the digits with their neighbours all at once.
+
+def duplicate_digit_bonus(n):
+    return sum(10 ** (k - 2) * (2 if last else 1) for (k, last) in digits.digit_runs(n))
+
+def is_zigzag(n):
+    return digits.is_zigzag(n)
+
+def next_zigzag(n):
+    return digits.next_zigzag(n)
+
+# Closed form of the sum of (n + k) * (m + k) over the h layers.
+
+def pyramid_blocks(n, m, h):
+    return h * n * m + (n + m) * h * (h - 1) // 2 + (h - 1) * h * (2 * h - 1) // 6
+
+def group_and_skip(n, out, ins):
+    result = []
+    while n > 0:
+        result.append(n % out)
+        n = n // out * ins
+    return result
@@ -0,0 +1,245 @@
+# Sequence engine for the reference solutions of the problems that ask
+# for terms of integer sequences defined by recurrences. Each sequence
+# keeps the prefix of its terms computed so far in a compact array, and
+# extends that prefix only when a query goes past its end, so that all
+# the queries of a test run together cost no more than computing the
+# sequence once up to the farthest of them. The prefixes can also be
+# kept on disk between runs, so that repeated runs start from them.
+
+from array import array
+from fractions import Fraction
+from math import isqrt
+from hashlib import sha256
+import os.path
+import sys
+import tempfile
+
+# Directory for the prefixes kept between runs, or None to keep them only
+# in memory. A prefix is saved whenever it has been extended.
+cache_dir = None
+
+# Each sequence has the type code of the array of its terms, or None for
+# terms that are not machine integers and are kept in a list, and the
+# function that extends the prefix to the given length. The extension
+# function also gets the state that it needs to continue the recurrence
+# from the end of the prefix, which it returns updated. When the prefix
+# has been loaded from disk, that state starts out as None and is then
+# rebuilt from the prefix itself.
+
+__sequences = dict()
+
+def sequence(typecode):
+    def register(extend):
+        __sequences[extend.__name__] = {'typecode': typecode, 'extend': extend, 'terms': None, 'state': None}
+        return extend
+    return register
+
+def __filename(name, typecode):
+    return os.path.join(cache_dir, f"{name}.{typecode or 'txt'}")
+
+# Each cache file starts with a header line that names the sequence, the
+# type code and byte order of its terms, the version of the function that
+# computed them, the number of terms and the digest of the terms that
+# follow. The version is a digest of the compiled code of the extension
+# function, so that the file of a sequence whose definition has since
+# changed is not trusted. The terms of an array are stored as its bytes,
+# and the other terms as one line of decimal text each, integers as such
+# and fractions, even the whole ones, as numerator/denominator, so that
+# reading a file never executes anything that it contains. A file that
+# does not match its header, or is missing or cannot be read, counts as
+# empty, and the prefix is computed from scratch. A file is written in
+# whole under a temporary name and only then renamed over the old one,
+# so that an interrupted run never leaves behind part of a prefix.
+
+def __version(entry):
+    code = entry['extend'].__code__
+    return sha256(code.co_code + repr(code.co_consts).encode('utf-8')).hexdigest()[:16]
+
+def __header(name, entry, count, payload):
+    fields = [name, entry['typecode'] or '-', sys.byteorder, __version(entry), str(count),
+              sha256(payload).hexdigest()]
+    return (" ".join(fields) + "\n").encode('ascii')
+
+def __load(name, entry):
+    empty = array(entry['typecode']) if entry['typecode'] else []
+    if not cache_dir or not os.path.exists(__filename(name, entry['typecode'])):
+        return empty
+    try:
+        with open(__filename(name, entry['typecode']), 'rb') as f:
+            header, payload = f.readline(), f.read()
+        count = int(header.split()[4])
+        if header != __header(name, entry, count, payload):
+            return empty
+        if entry['typecode']:
+            terms = array(entry['typecode'])
+            terms.frombytes(payload)
+        else:
+            terms = [Fraction(x) if '/' in x else int(x) for x in payload.decode('ascii').split()]
+    except (OSError, ValueError, IndexError, UnicodeDecodeError):
+        return empty
+    return terms if len(terms) == count else empty
+
+def __save(name, entry):
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok = True)
+        terms = entry['terms']
+        if entry['typecode']:
+            payload = terms.tobytes()
+        else:
+            payload = "".join(f"{x.numerator}/{x.denominator}\n" if isinstance(x, Fraction) else f"{x}\n"
+                              for x in terms).encode('ascii')
+        with tempfile.NamedTemporaryFile('wb', dir = cache_dir, delete = False) as f:
+            f.write(__header(name, entry, len(terms), payload))
+            f.write(payload)
+        os.replace(f.name, __filename(name, entry['typecode']))
+
+# The prefix of at least n terms of the named sequence. The prefix grows
+# at least by half of its length, so that queries at slowly increasing
+# positions do not each extend it by only a few terms.
+
+def terms(name, n):
+    entry = __sequences[name]
+    if entry['terms'] is None:
+        entry['terms'] = __load(name, entry)
+    if len(entry['terms']) < n:
+        n = max(n, len(entry['terms']) * 3 // 2)
+        entry['state'] = entry['extend'](entry['terms'], entry['state'], n)
+        __save(name, entry)
+    return entry['terms']
+
+# The number of terms and the bytes of memory of each sequence, counting
+# both its prefix and the state of its recurrence.
+
+def __size(x):
+    if isinstance(x, (array, bytearray, bytes)):
+        return sys.getsizeof(x)
+    if isinstance(x, (list, tuple)):
+        return sys.getsizeof(x) + sum(__size(y) for y in x)
+    return sys.getsizeof(x)
+
+def memory_usage():
+    return {name: (len(entry['terms']), __size(entry['terms']) + __size(entry['state']))
+            for (name, entry) in __sequences.items() if entry['terms'] is not None}
+
+# Recaman: the terms a(1), a(2), ... starting from a(0) = 0, which is not
+# stored. The values already in the sequence are marked in a bytearray
+# that is grown by doubling.
+
+@sequence('I')
+def recaman(terms, seen, n):
+    if seen is None:
+        seen = bytearray(2 * max(terms, default = 0) + 2)
+        seen[0] = 1
+        for x in terms:
+            seen[x] = 1
+    curr = terms[-1] if terms else 0
+    for i in range(len(terms) + 1, n + 1):
+        if curr - i > 0 and not seen[curr - i]:
+            curr -= i
+        else:
+            curr += i
+            if curr >= len(seen):
+                seen.extend(bytes(max(len(seen), curr + 1 - len(seen))))
+        seen[curr] = 1
+        terms.append(curr)
+    return seen
+
+# Van Eck: each term is the distance back to the previous appearance of
+# the term before it. The position where each value last appeared is
+# kept in an array indexed by the value, since the values of the first
+# n terms are all less than n.
+
+@sequence('i')
+def van_eck(terms, last, n):
+    if not terms:
+        terms.append(0)
+    if last is None:
+        last = array('i', [-1]) * len(terms)
+        for (i, x) in enumerate(terms[:-1]):
+            last[x] = i
+    last.extend(array('i', [-1]) * (n - len(last)))
+    i, x = len(terms) - 1, terms[-1]
+    while i + 1 < n:
+        j = last[x]
+        last[x] = i
+        x = i - j if j >= 0 else 0
+        terms.append(x)
+        i += 1
+    return last
+
+# Stern's diatomic sequence, whose consecutive terms are the numerators
+# and denominators of the Calkin-Wilf sequence. The pair fusc(m) and
+# fusc(m + 1) for the prefixes m of the bits of n, starting from m = 0,
+# follows from fusc(2m) = fusc(m) and fusc(2m + 1) = fusc(m) + fusc(m + 1),
+# so that the pair for n needs only one step for each bit of n.
+
+def fusc_pair(n):
+    x, y = 0, 1
+    for bit in bin(n)[2:] if n > 0 else '':
+        if bit == '1':
+            x = x + y
+        else:
+            y = x + y
+    return (x, y)
+
+# Kempner: the exact partial sums of the reciprocals of the positive
+# integers whose digits contain no nine. The state is the last integer
+# that was added to the sum.
+
+@sequence(None)
+def kempner(terms, k, n):
+    if k is None:
+        k = 0
+        for i in range(len(terms)):
+            k += 1
+            while '9' in str(k):
+                k += 1
+    total = terms[-1] if terms else Fraction(0)
+    while len(terms) < n:
+        k += 1
+        while '9' in str(k):
+            k += 1
+        total += Fraction(1, k)
+        terms.append(total)
+    return k
+
+# The first column of the Wythoff array, whose r:th element is
+# floor(floor((r + 1) phi) phi), with floor(k phi) computed exactly as
+# (k + isqrt(5 k**2)) // 2. The row of a given element of that column is
+# found by inverting both floors, each of which is off by at most one
+# from floor(v / phi) computed the same way.
+
+def __floor_phi(k):
+    return (k + isqrt(5 * k * k)) // 2
+
+def __inverse_floor_phi(v):
+    k = max((isqrt(5 * v * v) - v) // 2 - 1, 0)
+    while __floor_phi(k) < v:
+        k += 1
+    return k
+
+def wythoff_row(first):
+    return __inverse_floor_phi(__inverse_floor_phi(first)) - 1
+
+# The Fibonacci numbers 1, 2, 3, 5, 8, ... that appear in the Zeckendorf
+# representations, kept in a list since they soon outgrow machine words.
+
+@sequence(None)
+def fibonacci(terms, state, n):
+    if not terms:
+        terms.extend([1, 2])
+    while len(terms) < n:
+        terms.append(terms[-1] + terms[-2])
+    return state
+
+# The positions where the blocks of k-digit numbers begin in the counting
+# series 123456789101112..., that is, 0, 9, 189, 2889, ...
+
+@sequence(None)
+def digit_blocks(terms, state, n):
+    if not terms:
+        terms.append(0)
+    while len(terms) < n:
+        k = len(terms)
+        terms.append(terms[-1] + 9 * 10 ** (k - 1) * k)
+    return state
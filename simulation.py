@@ -0,0 +1,151 @@
+# Simulation engine for the reference solutions of the problems that
+# apply a deterministic move to a state until the state stops changing,
+# starts repeating, or runs out of steps. Each state is kept in a compact
+# encoding that the move can update in place in constant time, instead
+# of building a new list or a new object for every move.
+
+# Modulus and base of the polynomial hashes of the multisets of integers.
+hash_mod = 2**61 - 1
+hash_base = 3**20 + 7
+
+# At most this many breadth first searches are kept for reuse, after
+# which they are all thrown away to start over.
+cached_searches = 1000
+
+# Brent's cycle detection over the states produced by the move f, which
+# returns None once there is no next state. The states up to the given
+# number of steps are returned as a list. Once some state equals the
+# one saved at the latest power of two, the states since then form the
+# cycle, and the rest of the list is filled in by repeating that cycle
+# without computing any more moves. Only that one saved state is ever
+# compared against, so the states need not even be hashable.
+
+def trajectory(x, f, steps):
+    result = [x]
+    saved, power, lam = x, 1, 0
+    while len(result) <= steps:
+        x = f(x)
+        if x is None:
+            return result
+        result.append(x)
+        lam += 1
+        if x == saved:
+            cycle = result[-lam:]
+            while len(result) <= steps:
+                result.extend(cycle)
+            del result[steps + 1:]
+            return result
+        if lam == power:
+            saved, power, lam = x, 2 * power, 0
+    return result
+
+# Bulgarian solitaire takes one pebble from every pile to form a new pile.
+# Every pile is stored as the sum of its size and the number of moves so
+# far, so that the move leaves all the existing piles as they are. The
+# piles are counted by that sum, so the piles that became empty are the
+# ones whose sum equals the new number of moves. The multiset of the pile
+# sizes has a polynomial hash that each move updates in constant time,
+# since decreasing every size by one divides the hash by the base, and
+# the goal state is checked for real only when the hashes are equal.
+
+def bulgarian_moves(piles, k):
+    count = [0] * (2 * k * k + 2)
+    for p in piles:
+        count[p] += 1
+    inverse = pow(hash_base, hash_mod - 2, hash_mod)
+    h = sum(pow(hash_base, p, hash_mod) for p in piles) % hash_mod
+    goal = sum(pow(hash_base, s, hash_mod) for s in range(1, k + 1)) % hash_mod
+    t, m = 0, len(piles)
+    top = pow(hash_base, m, hash_mod)
+    while h != goal or m != k or any(count[t + s] != 1 for s in range(1, k + 1)):
+        t += 1
+        if t + m >= len(count):
+            count.extend([0] * len(count))
+        # The piles of one pebble become empty, the rest shrink by one,
+        # and the pebbles taken from the m piles form a new pile.
+        empty = count[t]
+        count[t + m] += 1
+        h = (h * inverse - empty + top) % hash_mod
+        m += 1 - empty
+        if empty == 0:
+            top = top * hash_base % hash_mod
+        elif empty > 1:
+            top = pow(hash_base, m, hash_mod)
+    return t
+
+# Sandpile on the integer line: every position with at least left + right
+# coins gives left coins to its predecessor and right coins to its
+# successor, as many times over at once as it has enough coins for. The
+# final state does not depend on the order of these moves, so the coins
+# are swept through in passes in the direction where more of them spill,
+# which carries the coins spilled in one position along to the next one
+# within the same pass, instead of moving them one position per pass.
+# The coins are kept in a list with the offset of its first position,
+# and the sweeps only cover the positions that changed in the previous
+# pass, with the list doubled to both directions when they reach its end.
+
+def topple(piles, left, right):
+    if left > right:
+        (start, coins) = topple(piles[::-1], right, left)
+        return (len(piles) - start - len(coins), coins[::-1])
+    total = left + right
+    coins = [0] * len(piles) + list(piles) + [0] * len(piles)
+    offset = -len(piles)
+    lo, hi = len(piles), 2 * len(piles) - 1
+    while lo <= hi:
+        if lo < 1 or hi >= len(coins) - 1:
+            extra = len(coins)
+            coins = [0] * extra + coins + [0] * extra
+            offset, lo, hi = offset - extra, lo + extra, hi + extra
+        changed_lo, changed_hi = len(coins), -1
+        for i in range(lo, hi + 1):
+            c = coins[i]
+            if c >= total:
+                k = c // total
+                coins[i] = c - k * total
+                coins[i - 1] += k * left
+                coins[i + 1] += k * right
+                if changed_lo > i - 1:
+                    changed_lo = i - 1
+                changed_hi = i + 1
+        lo, hi = changed_lo, changed_hi
+    first = next(i for (i, c) in enumerate(coins) if c > 0)
+    last = len(coins) - next(i for (i, c) in enumerate(reversed(coins)) if c > 0)
+    return (first + offset, coins[first:last])
+
+# Bidirectional breadth first search for the length of the shortest path
+# from start to end, given the moves to the successors and to the
+# predecessors of each state. The searches from each start and from each
+# end are kept, so that later queries from the same start or to the same
+# end continue them instead of starting over. Once the depths of the two
+# searches add up to at least the shortest meeting found so far, no
+# shorter path can meet any deeper.
+
+__searches = dict()
+
+def __search(moves, origin):
+    if len(__searches) > cached_searches:
+        __searches.clear()
+    if (moves, origin) not in __searches:
+        __searches[(moves, origin)] = [{origin: 0}, [origin], 0]
+    return __searches[(moves, origin)]
+
+def shortest_distance(start, end, forward, backward):
+    fs, bs = __search(forward, start), __search(backward, end)
+    (small, large) = (fs[0], bs[0]) if len(fs[0]) <= len(bs[0]) else (bs[0], fs[0])
+    best = min((d + large[v] for (v, d) in small.items() if v in large), default = None)
+    while best is None or best > fs[2] + bs[2]:
+        (s, moves, other) = (fs, forward, bs[0]) if len(fs[1]) <= len(bs[1]) else (bs, backward, fs[0])
+        if not s[1]:
+            return best
+        dist, frontier = s[0], []
+        s[2] += 1
+        for u in s[1]:
+            for v in moves(u):
+                if v not in dist:
+                    dist[v] = s[2]
+                    frontier.append(v)
+                    if v in other and (best is None or s[2] + other[v] < best):
+                        best = s[2] + other[v]
+        s[1] = frontier
+    return best
@@ -0,0 +1,113 @@
+# String kernel for the reference solutions of the problems about the
+# palindromes, periods and rotations of a string. Each function runs in
+# time linear in the length of the string, reusing what it has already
+# found out about the string instead of comparing the same characters
+# over and over again, as checking each candidate separately would.
+
+# Manacher: the radius of the longest palindrome around each center of
+# the string with a separator between each two characters, so that the
+# centers of the even palindromes are also positions of that string. The
+# radius equals the length of that palindrome in the original string. A
+# palindrome inside a longer one has a mirror image on its other side,
+# whose radius is the starting point for the radius of this one. The
+# characters are compared as their code points, with negative numbers
+# for the separators and the two different sentinels at the ends, which
+# stop the palindromes without checking the bounds.
+
+def palindrome_radii(text):
+    s = [-1] * (2 * len(text) + 3)
+    s[0], s[-1] = -2, -3
+    s[2:-2:2] = map(ord, text)
+    radii = [0] * len(s)
+    c, right = 0, 0
+    for i in range(1, len(s) - 1):
+        r = min(right - i, radii[2 * c - i]) if i < right else 0
+        while s[i - r - 1] == s[i + r + 1]:
+            r += 1
+        radii[i] = r
+        if i + r > right:
+            c, right = i, i + r
+    return radii[1:-1]
+
+# Of the palindromes that are equally long, the one around the leftmost
+# center also starts leftmost, so the first longest radius is the answer.
+
+def longest_palindrome(text):
+    if not text:
+        return ''
+    radii = palindrome_radii(text)
+    r = max(radii)
+    i = radii.index(r)
+    return text[(i - r) // 2:(i - r) // 2 + r]
+
+# Z-function: for each position, the length of the longest common prefix
+# of the string and its suffix starting at that position. The rightmost
+# match found so far tells how far the next prefix matches for free.
+
+def z_function(s):
+    n = len(s)
+    z = [0] * n
+    if n > 0:
+        z[0] = n
+    left, right = 0, 0
+    for i in range(1, n):
+        k = min(right - i, z[i - left]) if i < right else 0
+        while i + k < n and s[k] == s[i + k]:
+            k += 1
+        z[i] = k
+        if i + k > right:
+            left, right = i, i + k
+    return z
+
+# The shortest period of the string that divides its length, that is,
+# the number of its distinct cyclic shifts.
+
+def primitive_period(s):
+    z = z_function(s)
+    n = len(s)
+    for p in range(1, n):
+        if n % p == 0 and z[p] == n - p:
+            return p
+    return n
+
+# Booth: the starting position of the lexicographically least rotation
+# of the string, found with the failure function of the doubled string
+# the same way as in Knuth-Morris-Pratt. Of equal rotations, the one
+# that starts leftmost is returned.
+
+def least_rotation(s):
+    ss = s + s
+    f = [-1] * len(ss)
+    k = 0
+    for j in range(1, len(ss)):
+        c = ss[j]
+        i = f[j - k - 1]
+        while i != -1 and c != ss[k + i + 1]:
+            if c < ss[k + i + 1]:
+                k = j - i - 1
+            i = f[i]
+        if c != ss[k + i + 1]:
+            if c < ss[k]:
+                k = j
+            f[j - k] = -1
+        else:
+            f[j - k] = i + 1
+    return k
+
+# The k:th character of the infinite Fibonacci word, the limit of the
+# words S(0) = '0', S(1) = '01' and S(n) = S(n - 1) + S(n - 2), given the
+# list of the lengths 1, 2, 3, 5, ... of these words that extends past k.
+# Since S(n) begins with S(n - 1), the position descends into either of
+# these two parts until it lands in S(0) or S(1).
+
+def fibonacci_word(k, lengths):
+    n = 0
+    while lengths[n] <= k:
+        n += 1
+    while n > 1:
+        if k < lengths[n - 1]:
+            n -= 1
+        else:
+            k -= lengths[n - 1]
+            n -= 2
+    return '01'[k]
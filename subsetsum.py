@@ -0,0 +1,102 @@
+# Dynamic programming engine for the subset sum style problems, using
+# Python integers as bitsets whose bit k is on when the sum k can be
+# reached. Adding an item x to the choices turns the bitset b into
+# b | (b << x), which handles all the sums reached so far in one step,
+# instead of enumerating the subsets that reach them.
+
+from functools import lru_cache
+from itertools import compress
+from numtheory import iroot
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+# The positions of the bits that are on, in ascending order.
+
+__digit_values = bytes.maketrans(b'01', bytes([0, 1]))
+
+def bit_positions(bits):
+    digits = bin(bits)[:1:-1].encode().translate(__digit_values)
+    return list(compress(range(len(digits)), digits))
+
+# The bitset of the sums of the subsets of items, up to limit if given.
+
+def reachable_sums(items, limit = None):
+    bits = 1
+    mask = (1 << (limit + 1)) - 1 if limit is not None else None
+    for x in items:
+        bits |= bits << x
+        if mask is not None:
+            bits &= mask
+    return bits
+
+# The bitset of all sums a + b of two items that need not be distinct.
+
+def pair_sums(items):
+    single = 0
+    for x in items:
+        single |= 1 << x
+    bits = 0
+    for x in items:
+        bits |= single << x
+    return bits
+
+# Sums of distinct cubes. The bitset reachable with the cubes of 1, ...,
+# k is kept for every k up to the cube root of cube_limit, which tells
+# immediately whether the small remainders can be broken down at all.
+# The lexicographically highest breakdown of n is then reconstructed by
+# descending through the largest cubes, and the remainders that are too
+# large for the bitsets are broken down recursively and memoized.
+
+cube_limit = 2**17
+
+__cube_bits = [1]
+
+def __cubes_reachable(n, k):
+    k = min(k, len(__cube_bits) - 1)
+    return __cube_bits[k] >> n & 1
+
+def __grow_cube_bits():
+    mask = (1 << (cube_limit + 1)) - 1
+    for k in range(1, iroot(cube_limit, 3) + 1):
+        __cube_bits.append((__cube_bits[-1] | __cube_bits[-1] << k ** 3) & mask)
+
+@lru_cache(maxsize = 2**16)
+def __distinct_cubes(n, a):
+    if n == 0:
+        return ()
+    if n > (a * (a + 1) // 2) ** 2:
+        return None
+    if n <= cube_limit and not __cubes_reachable(n, a):
+        return None
+    for b in range(min(a, iroot(n, 3)), 0, -1):
+        rest = __distinct_cubes(n - b ** 3, b - 1)
+        if rest is not None:
+            return (b,) + rest
+    return None
+
+def distinct_cubes(n):
+    if len(__cube_bits) == 1:
+        __grow_cube_bits()
+    result = __distinct_cubes(n, iroot(n, 3))
+    return list(result) if result is not None else None
+
+# Subsets of a set of n elements as bitmasks, grown one element at a time
+# through those subsets that satisfy the condition for their size, so
+# that every subset of the last nonempty layer is the end of a chain of
+# valid subsets that starts from the empty one.
+
+def longest_subset_chain(n, valid):
+    layer, size = {0}, 0
+    while True:
+        tried, nxt = set(), []
+        for mask in layer:
+            for i in range(n):
+                m = mask | 1 << i
+                if m != mask and m not in tried:
+                    tried.add(m)
+                    if valid(m, size + 1):
+                        nxt.append(m)
+        if not nxt:
+            return size
+        layer, size = nxt, size + 1
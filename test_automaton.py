@@ -0,0 +1,25 @@
+# Tests for the Aho-Corasick automaton used by the reference solutions,
+# checked against generating all strings over the letters and filtering
+# out those that contain some pattern. Run with python -m pytest.
+
+import itertools as it
+import pytest
+import automaton
+
+def brute_force(letters, n, patterns):
+    words = (''.join(p) for p in it.product(letters, repeat = n))
+    return [w for w in words if not any(pat in w for pat in patterns)]
+
+@pytest.mark.parametrize('letters, n, patterns', [
+    ('AB', 3, ['BB']),
+    ('AB', 3, ['ACB', 'BB']),
+    ('AB', 4, ['C', 'ABA']),
+    ('ABC', 4, ['AB', 'BCA', 'CC']),
+    ('ABC', 5, ['ABCD', 'B', 'CA']),
+    ('AB', 2, ['A', 'B']),
+    ('AB', 0, ['A']),
+])
+def test_strings_avoiding(letters, n, patterns):
+    expected = brute_force(letters, n, patterns)
+    assert list(automaton.strings_avoiding(letters, n, patterns)) == expected
+    assert automaton.count_avoiding(letters, n, patterns) == len(expected)
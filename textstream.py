@@ -0,0 +1,49 @@
+# Text engine for the reference solutions of the problems that transform
+# text, written to process arbitrarily long text as a stream of chunks
+# so that the whole text never needs to be in memory at once. The work
+# on each chunk is done by the string methods that run in C, instead of
+# looping through the characters in Python.
+
+# Expanding the tabs is exactly what str.expandtabs does with spaces.
+# For any other fill character, the spaces already in the text are first
+# hidden as NUL characters, so that the spaces that expandtabs adds can
+# be told apart from them. The text must then contain no NUL characters,
+# and no line breaks, after which expandtabs would restart the columns.
+
+def detab(text, n = 8, sub = ' '):
+    if sub == ' ':
+        return text.expandtabs(n) if '\n' not in text and '\r' not in text else __detab_slow(text, n, sub)
+    if '\0' in text or '\n' in text or '\r' in text:
+        return __detab_slow(text, n, sub)
+    return text.replace(' ', '\0').expandtabs(n).replace(' ', sub).replace('\0', ' ')
+
+def __detab_slow(text, n, sub):
+    result, col = [], 0
+    for (i, part) in enumerate(text.split('\t')):
+        if i > 0:
+            pad = n - col % n
+            result.append(sub * pad)
+            col += pad
+        result.append(part)
+        col += len(part)
+    return ''.join(result)
+
+# Detab a stream of text chunks that consist of lines, each line being
+# detabbed on its own. The chunks may split the lines anywhere, so the
+# unfinished last line of each chunk is carried over into the next one,
+# and each detabbed chunk that is yielded ends at the end of a line.
+
+def detab_stream(chunks, n = 8, sub = ' '):
+    carry = ''
+    for chunk in chunks:
+        end = chunk.rfind('\n') + 1
+        if end == 0:
+            carry += chunk
+            continue
+        text, carry = carry + chunk[:end], chunk[end:]
+        if sub == ' ' and '\r' not in text:
+            yield text.expandtabs(n)
+        else:
+            yield '\n'.join([detab(line, n, sub) for line in text[:-1].split('\n')]) + '\n'
+    if carry:
+        yield detab(carry, n, sub)
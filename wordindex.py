@@ -0,0 +1,170 @@
+# Indexes over a list of words for the reference solutions of the word
+# problems. Every test case of these problems passes the same list of
+# words, so each index is built the first time it is needed for a word
+# list, and reused for all later queries over that same list.
+
+from array import array
+from itertools import compress
+import sys
+
+# Built indexes, keyed by the identity of the word list and whatever
+# else the index depends on. The objects themselves are kept along with
+# the index, so that an identity cannot be reused while it is cached.
+__cache = dict()
+
+def __cached(kind, words, extra, build):
+    key = (kind, id(words), id(extra))
+    entry = __cache.get(key)
+    if entry is None or entry[0] is not words or entry[1] is not extra or entry[2] != len(words):
+        entry = (words, extra, len(words), build())
+        __cache[key] = entry
+    return entry[3]
+
+# The words of the list grouped by their length, each group sorted.
+
+def length_buckets(words):
+    def build():
+        buckets = dict()
+        for w in words:
+            buckets.setdefault(len(w), []).append(w)
+        for bucket in buckets.values():
+            bucket.sort()
+        return buckets
+    return __cached('length', words, None, build)
+
+# Index for finding the word of the same length at the smallest sum of
+# letter distances. Each word is a 16-bit lane in one bytes object for
+# each position, holding the code of its letter in that position. For a
+# query letter, a flat table of the distances from it to every letter
+# translates a column into the lanes of those distances in one call,
+# and adding these columns together as big integers sums the distances
+# of all words at once. This needs the distances to be small integers
+# that cannot overflow a lane, and otherwise the words are compared one
+# at a time, abandoning each word once it is no better than the best.
+
+def __autocorrect_index(words, df):
+    def build():
+        alphabet = sorted(set(c for w in words for c in w))
+        code = {c: i + 1 for (i, c) in enumerate(alphabet)}
+        columns = dict()
+        if len(alphabet) < 256:
+            for (n, bucket) in length_buckets(words).items():
+                columns[n] = [bytes(x for w in bucket for x in (0, code[w[i]])) for i in range(n)]
+        return {'alphabet': alphabet, 'code': code, 'columns': columns, 'rows': dict()}
+    return __cached('autocorrect', words, df, build)
+
+def __distance_row(index, df, c):
+    rows = index['rows']
+    if c not in rows:
+        dists = [df(c, c2) for c2 in index['alphabet']]
+        if all(type(d) == int and 0 <= d < 256 for d in dists):
+            rows[c] = (bytes([0] + dists + [0] * (255 - len(dists))), max(dists, default = 0))
+        else:
+            rows[c] = None
+    return rows[c]
+
+def __closest_by_lanes(word, bucket, cols, rows):
+    total = 0
+    for (col, (row, _)) in zip(cols, rows):
+        total += int.from_bytes(col.translate(row), 'big')
+    lanes = array('H', total.to_bytes(2 * len(bucket), 'big'))
+    if sys.byteorder == 'little':
+        lanes.byteswap()
+    return bucket[lanes.index(min(lanes))]
+
+def __closest_by_scan(word, bucket, df):
+    best, best_d = None, None
+    for w in bucket:
+        d = 0
+        for (c1, c2) in zip(word, w):
+            d += df(c1, c2)
+            if best_d is not None and d >= best_d:
+                break
+        else:
+            best, best_d = w, d
+    return best
+
+# The closest word for each of the query words, or None for a query
+# word that has no word of the same length in the list.
+
+def autocorrect_words(queries, words, df):
+    index = __autocorrect_index(words, df)
+    buckets = length_buckets(words)
+    result = []
+    for word in queries:
+        bucket = buckets.get(len(word))
+        if not bucket:
+            result.append(None)
+            continue
+        cols = index['columns'].get(len(word))
+        rows = [__distance_row(index, df, c) for c in word] if cols else None
+        if rows and None not in rows and sum(r[1] for r in rows) < 65536:
+            result.append(__closest_by_lanes(word, bucket, cols, rows))
+        else:
+            result.append(__closest_by_scan(word, bucket, df))
+    return result
+
+# Index for the Hangman patterns. For each length, position and letter,
+# a bitset over the words of that length tells which of those words have
+# that letter in that position, so that the words matching a pattern
+# are found by intersecting one bitset for each position of the pattern.
+
+def __bitset(indices, n):
+    bits = bytearray(b'0') * n
+    for i in indices:
+        bits[n - 1 - i] = ord('1')
+    return int(bits, 2)
+
+def __letter_bitsets(words):
+    def build():
+        bitsets = dict()
+        for (n, bucket) in length_buckets(words).items():
+            positions = []
+            for p in range(n):
+                indices = dict()
+                for (i, w) in enumerate(bucket):
+                    indices.setdefault(w[p], []).append(i)
+                positions.append({c: __bitset(ii, len(bucket)) for (c, ii) in indices.items()})
+            bitsets[n] = positions
+        return bitsets
+    return __cached('letters', words, None, build)
+
+# The words that the bits of the mask stand for, in ascending order.
+
+__digit_values = bytes.maketrans(b'01', bytes([0, 1]))
+
+def __select(bucket, mask):
+    return list(compress(bucket, bin(mask)[:1:-1].encode().translate(__digit_values)))
+
+def hangman_matches(words, pattern):
+    bucket = length_buckets(words).get(len(pattern))
+    if not bucket:
+        return []
+    positions = __letter_bitsets(words)[len(pattern)]
+    revealed = set(pattern) - {'*'}
+    mask = (1 << len(bucket)) - 1
+    for (pos, c) in zip(positions, pattern):
+        if c == '*':
+            for c2 in revealed:
+                mask &= ~pos.get(c2, 0)
+        else:
+            mask &= pos.get(c, 0)
+        if not mask:
+            return []
+    return __select(bucket, mask)
+
+# Index of the words by their shape, the tuple of signs of differences
+# between consecutive letters, so that each query is one dictionary
+# lookup.
+
+def __shapes(words):
+    def build():
+        shapes = dict()
+        for w in sorted(words):
+            shape = tuple((c2 > c1) - (c2 < c1) for (c1, c2) in zip(w, w[1:]))
+            shapes.setdefault(shape, []).append(w)
+        return shapes
+    return __cached('shapes', words, None, build)
+
+def words_of_shape(words, shape):
+    return list(__shapes(words).get(tuple(shape), []))